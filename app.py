@@ -4,125 +4,77 @@
 Modern web app with real-time feedback analysis and intelligent prioritization
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Blueprint, current_app, request, jsonify, render_template_string
 from flask_cors import CORS
-import json
 import datetime
 import logging
+import os
 from pathlib import Path
+from changes import init_changes
+from export import init_export
+from ratelimit import init_rate_limits
+from rules import RuleBook
+from storage import FeedbackStore
+from trends import init_trends
 
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-app = Flask(__name__)
-CORS(app)
+bp = Blueprint('feedback', __name__)
+SCORING_BACKEND = os.environ.get("SCORING_BACKEND", "rules")
+rulebook = RuleBook()
 
-# Storage
-feedback_file = Path("customer_feedback.json")
-if not feedback_file.exists():
-    feedback_file.write_text("[]")
+def create_app(feedback_path=None, rate_limits=None):
+    """App factory: storage and optional components are initialized here, not at import time"""
+    app = Flask(__name__)
+    CORS(app)
+
+    if os.environ.get("PROFILING_ENABLED", "1") == "1":
+        from profiling import init_profiling
+        init_profiling(app)
+
+    init_rate_limits(app, rate_limits)
+    init_export(app)
+    init_changes(app)
+    init_trends(app)
+
+    # Storage (shared by all worker processes through the file, never through module state)
+    store = FeedbackStore(Path(feedback_path or os.environ.get("FEEDBACK_FILE", "customer_feedback.json")))
+    store.initialize()
+    app.extensions['feedback_store'] = store
+    # Replay the trend window here so gunicorn's preload pays for it once, not each worker's first submit
+    app.extensions['trend_tracker'].sync(store)
+
+    app.register_blueprint(bp)
+    return app
+
+def get_store():
+    return current_app.extensions['feedback_store']
 
 def load_feedback():
-    try:
-        return json.loads(feedback_file.read_text())
-    except:
-        return []
+    return get_store().load()
 
 def save_feedback(feedback_list):
-    try:
-        feedback_file.write_text(json.dumps(feedback_list, indent=2))
-        return True
-    except:
-        return False
+    return get_store().save(feedback_list)
 
 def analyze_feedback(text, category="general"):
-    """AI-powered feedback analysis"""
-    text = text.lower()
-    
-    # Pattern matching for intelligent analysis
-    security_patterns = ['hack', 'breach', 'security', 'unauthorized', 'compromised']
-    system_failure_patterns = ['not work', 'down', 'crash', 'broken', 'stuck', 'unavailable']
-    performance_patterns = ['slow', 'lag', 'delay', 'loading', 'performance']
-    
-    urgency_contexts = [
-        ('losing money', 10), ('revenue impact', 10), ('security', 10),
-        ('critical', 9), ('urgent', 8), ('important', 7),
-        ('problem', 6), ('issue', 5), ('suggestion', 2)
-    ]
-    
-    impact_contexts = [
-        ('all users', 10), ('everyone', 10), ('many users', 8),
-        ('customers', 7), ('users', 6), ('some', 4)
-    ]
-    
-    # Score calculation
-    urgency_score = 3
-    impact_score = 3
-    
-    # Security critical
-    if any(pattern in text for pattern in security_patterns):
-        urgency_score, impact_score, theme = 10, 10, "Security Critical"
-    # System failure
-    elif any(pattern in text for pattern in system_failure_patterns):
-        urgency_score, impact_score, theme = 8, 8, "System Failure"
-    else:
-        # Contextual scoring
-        for context, score in urgency_contexts:
-            if context in text:
-                urgency_score = max(urgency_score, score)
-                break
-        
-        for context, score in impact_contexts:
-            if context in text:
-                impact_score = max(impact_score, score)
-                break
-        
-        # Theme detection
-        if any(pattern in text for pattern in performance_patterns):
-            theme = "Performance"
-        elif any(word in text for word in ['bug', 'error', 'problem']):
-            theme = "Bug"
-        elif any(word in text for word in ['design', 'ui', 'ux', 'interface']):
-            theme = "UI/UX"
-        elif any(word in text for word in ['feature', 'add', 'want', 'request']):
-            theme = "Feature"
-        else:
-            theme = "General"
-    
-    priority_score = min(10, max(urgency_score, impact_score, (urgency_score + impact_score) // 2))
-    confidence = min(95, 60 + len(text) // 10)
-    assigned_team = get_team_assignment(priority_score, theme)
-    
-    return {
-        'urgency': urgency_score,
-        'impact': impact_score,
-        'priority': priority_score,
-        'theme': theme,
-        'confidence': confidence,
-        'assigned_team': assigned_team
-    }
+    """AI-powered feedback analysis (the learned model with SCORING_BACKEND=model, else the rules)"""
+    if SCORING_BACKEND == "model":
+        from model import get_scoring_model
+        scoring_model = get_scoring_model()
+        if scoring_model is not None:
+            return scoring_model.analyze([text], get_team_assignment)[0]
+    return analyze_with_rules(text, category)
+
+def analyze_with_rules(text, category="general"):
+    """Rule-based feedback analysis, driven by the hot-reloaded scoring_rules.json"""
+    return rulebook.current().analyze(text.lower())
 
 def get_team_assignment(priority_score, theme):
     """Smart team assignment based on priority and theme"""
-    theme_lower = theme.lower()
-    
-    if theme_lower == 'security critical':
-        return "🚨 Security Team + Engineering + Product"
-    elif theme_lower == 'system failure':
-        return "🔧 Engineering Team (URGENT)"
-    elif priority_score >= 8:
-        return "Engineering + Product"
-    elif priority_score >= 6:
-        if theme_lower in ['ui/ux', 'design']:
-            return "Design Team"
-        elif theme_lower in ['bug', 'performance']:
-            return "Engineering Team"
-        else:
-            return "Product Team"
-    else:
-        return "Product Team"
+    return rulebook.current().assign_team(priority_score, theme)
 
-@app.route('/')
+@bp.route('/')
 def customer_form():
     """Customer feedback form with modern UI"""
     return render_template_string("""
@@ -512,7 +464,7 @@ def customer_form():
 </html>
     """)
 
-@app.route('/analyze', methods=['POST'])
+@bp.route('/analyze', methods=['POST'])
 def analyze_endpoint():
     try:
         data = request.json
@@ -522,14 +474,16 @@ def analyze_endpoint():
         if not feedback_text:
             return jsonify({'error': 'No feedback text provided'}), 400
         
-        analysis = analyze_feedback(feedback_text, category)
+        # Identical concurrent requests (e.g. double-fired keystrokes) share one analysis
+        coalescer = current_app.extensions['analyze_coalescer']
+        analysis = coalescer.run((feedback_text, category), lambda: analyze_feedback(feedback_text, category))
         return jsonify(analysis)
         
     except Exception as e:
         logger.error(f"Analysis error: {e}")
         return jsonify({'error': 'Analysis failed'}), 500
 
-@app.route('/submit', methods=['POST'])
+@bp.route('/submit', methods=['POST'])
 def submit_feedback():
     try:
         data = request.json
@@ -541,8 +495,8 @@ def submit_feedback():
         
         analysis = analyze_feedback(data['feedback'], data['category'])
         
+        # The store assigns the unique, monotonically increasing 'id'/'seq'
         feedback_entry = {
-            'id': datetime.datetime.now().isoformat(),
             'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'name': data['name'],
             'email': data['email'],
@@ -551,11 +505,10 @@ def submit_feedback():
             'analysis': analysis
         }
         
-        feedback_list = load_feedback()
-        feedback_list.append(feedback_entry)
-        
-        if save_feedback(feedback_list):
-            return jsonify({'success': True, 'message': 'Feedback submitted successfully'})
+        stored = get_store().append(feedback_entry)
+        if stored:
+            update_trends()
+            return jsonify({'success': True, 'message': 'Feedback submitted successfully', 'seq': stored['seq']})
         else:
             return jsonify({'error': 'Failed to save feedback'}), 500
             
@@ -563,7 +516,53 @@ def submit_feedback():
         logger.error(f"Submission error: {e}")
         return jsonify({'error': 'Failed to submit feedback'}), 500
 
-@app.route('/internal/dashboard')
+@bp.route('/internal/feedback/<int:seq>/correction', methods=['POST'])
+def correct_feedback(seq):
+    """Record a human correction of an entry's scores; the learned model trains on these"""
+    data = request.get_json(silent=True) or {}
+    correction = {}
+    for field in ('urgency', 'impact', 'priority'):
+        if field in data:
+            value = data[field]
+            if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= 10:
+                return jsonify({'error': f'{field} must be an integer from 1 to 10'}), 400
+            correction[field] = value
+    if 'theme' in data:
+        if not isinstance(data['theme'], str) or not data['theme'].strip():
+            return jsonify({'error': 'theme must be a non-empty string'}), 400
+        correction['theme'] = data['theme'].strip()
+    if not correction:
+        return jsonify({'error': 'Provide at least one of urgency, impact, priority, theme'}), 400
+
+    found = False
+
+    def mutate(feedback_list):
+        nonlocal found
+        for entry in feedback_list:
+            if entry.get('seq') == seq:
+                entry['correction'] = {**entry.get('correction', {}), **correction}
+                found = True
+                return
+
+    try:
+        get_store().update(mutate)
+    except OSError as e:
+        logger.error(f"Correction error: {e}")
+        return jsonify({'error': 'Failed to save correction'}), 500
+    if not found:
+        return jsonify({'error': f'No feedback with seq {seq}'}), 404
+    return jsonify({'success': True, 'seq': seq, 'correction': correction})
+
+def update_trends():
+    """Fold the latest submits into the trend windows and log newly detected spikes"""
+    try:
+        for spike in current_app.extensions['trend_tracker'].sync(get_store()):
+            logger.warning(f"🚨 Spike in {spike['kind']} '{spike['name']}': "
+                           f"{spike['recent_count']} in {spike['recent_minutes']} min (z={spike['z_score']})")
+    except (OSError, ValueError) as e:
+        logger.error(f"Trend update error: {e}")
+
+@bp.route('/internal/dashboard')
 def dashboard():
     """Internal dashboard with modern UI"""
     feedback_list = load_feedback()
@@ -843,7 +842,7 @@ def dashboard():
     </body></html>'''
     return render_template_string(dashboard_html)
 
-@app.route('/test')
+@bp.route('/test')
 def test_page():
     """Test page"""
     return render_template_string("""
@@ -870,9 +869,10 @@ if __name__ == '__main__':
     print(f"📍 Server: http://localhost:5001")
     print(f"🎯 Customer Form: http://localhost:5001/")
     print(f"📊 Dashboard: http://localhost:5001/internal/dashboard")
+    print("🏭 Production: python serve.py")
     print("=" * 50 + "\n")
     
     try:
-        app.run(debug=True, host='127.0.0.1', port=5001, threaded=True)
+        create_app().run(debug=True, host='127.0.0.1', port=5001, threaded=True)
     except Exception as e:
         print(f"❌ Server failed: {e}")
\ No newline at end of file
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+⏱️ Customer Feedback Prioritizer - Benchmark Suite
+Synthetic feedback generator, micro-benchmarks, end-to-end load tests and startup timing.
+
+Usage:
+    python benchmark.py --sizes 1000,10000 --output bench.json
+    python benchmark.py --sizes 1000 --compare bench.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+import app as feedback_app
+
+# Phrases chosen so that every branch of analyze_feedback is exercised
+THEME_PHRASES = {
+    'security': ['my account was hacked', 'possible data breach', 'unauthorized login from abroad',
+                 'security hole in the reset flow', 'my profile looks compromised'],
+    'failure': ['checkout does not work', 'the site is down again', 'app crash on launch',
+                'upload button is broken', 'stuck on the loading spinner forever', 'service unavailable'],
+    'performance': ['search is really slow', 'typing lag in the editor', 'long delay after login',
+                    'performance of the dashboard is bad'],
+    'bug': ['found a bug in the date picker', 'error when saving settings', 'there is a problem with exports'],
+    'ui': ['the new design is confusing', 'ui colors are hard to read', 'ux of onboarding',
+           'interface feels cluttered'],
+    'feature': ['please add dark mode', 'would love a feature for tags', 'we want csv import',
+                'feature request: keyboard shortcuts'],
+    'general': ['thanks for the great product', 'just sharing some thoughts', 'nice work on the update'],
+}
+
+URGENCY_PHRASES = ['', '', 'we are losing money', 'revenue impact is real', 'this is critical',
+                   'urgent please', 'important for us', 'small issue', 'just a suggestion']
+
+IMPACT_PHRASES = ['', '', 'affects all users', 'everyone on the team sees it', 'many users complain',
+                  'our customers noticed', 'some users only']
+
+CATEGORIES = ['bug', 'feature', 'performance', 'ui', 'general', 'complaint']
+
+
+def generate_feedback(count, seed=42):
+    """Yield `count` synthetic feedback submissions (lazily, so 10M entries fit in memory)"""
+    rng = random.Random(seed)
+    themes = list(THEME_PHRASES)
+    for i in range(count):
+        theme = rng.choice(themes)
+        parts = [rng.choice(THEME_PHRASES[theme]), rng.choice(URGENCY_PHRASES), rng.choice(IMPACT_PHRASES)]
+        yield {
+            'name': f'Bench User {i}',
+            'email': f'user{i}@example.com',
+            'category': rng.choice(CATEGORIES),
+            'feedback': '. '.join(p for p in parts if p),
+        }
+
+
+def summarize(name, size, latencies_ns, wall_s, **extra):
+    """Turn raw per-call latencies into a comparable result record"""
+    ordered = sorted(latencies_ns)
+    count = len(ordered)
+
+    def pct(p):
+        return ordered[min(count - 1, int(count * p))] / 1000 if count else 0.0
+
+    result = {
+        'name': name,
+        'size': size,
+        'calls': count,
+        'wall_s': round(wall_s, 4),
+        'ops_per_s': round(count / wall_s, 1) if wall_s else 0.0,
+        'mean_us': round(statistics.fmean(ordered) / 1000, 3) if count else 0.0,
+        'p50_us': round(pct(0.50), 3),
+        'p95_us': round(pct(0.95), 3),
+        'p99_us': round(pct(0.99), 3),
+    }
+    result.update(extra)
+    return result
+
+
+def bench_analyze_feedback(size, seed=42):
+    """Micro-benchmark analyze_feedback over `size` synthetic texts"""
+    latencies = array('q')
+    clock = time.perf_counter_ns
+    start = time.perf_counter()
+    for item in generate_feedback(size, seed):
+        t0 = clock()
+        feedback_app.analyze_feedback(item['feedback'], item['category'])
+        latencies.append(clock() - t0)
+    return summarize('analyze_feedback', size, latencies, time.perf_counter() - start)
+
+
+def bench_team_assignment(size, seed=42):
+    """Micro-benchmark get_team_assignment over every priority/theme combination"""
+    rng = random.Random(seed)
+    themes = ['Security Critical', 'System Failure', 'Performance', 'Bug', 'UI/UX', 'Feature', 'General']
+    latencies = array('q')
+    clock = time.perf_counter_ns
+    start = time.perf_counter()
+    for _ in range(size):
+        priority, theme = rng.randint(1, 10), rng.choice(themes)
+        t0 = clock()
+        feedback_app.get_team_assignment(priority, theme)
+        latencies.append(clock() - t0)
+    return summarize('get_team_assignment', size, latencies, time.perf_counter() - start)
+
+
+def seed_store(path, size, seed=42):
+    """Write `size` analyzed entries to `path`, streaming so large stores stay cheap to build"""
+    now = datetime.datetime.now()
+    with open(path, 'w') as f:
+        f.write('[\n')
+        for i, item in enumerate(generate_feedback(size, seed)):
+            entry = {
+                'id': str(i + 1),
+                'seq': i + 1,
+                'timestamp': now.strftime("%Y-%m-%d %H:%M:%S"),
+                **item,
+                'analysis': feedback_app.analyze_feedback(item['feedback'], item['category']),
+            }
+            if i:
+                f.write(',\n')
+            json.dump(entry, f)
+        f.write('\n]')
+
+
+def bench_endpoints(size, requests_per_route=200, seed=42):
+    """End-to-end load test of /submit, /analyze and /internal/dashboard against a store of `size` entries"""
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = Path(tmp) / 'customer_feedback.json'
+        seed_store(store_path, size, seed)
+        # Rate limits would reject a single-client load test, so they are disabled here
+        client = feedback_app.create_app(store_path, rate_limits={}).test_client()
+        payloads = list(generate_feedback(requests_per_route, seed + 1))
+        routes = [
+            ('POST /analyze', lambda p: client.post('/analyze', json=p), requests_per_route),
+            ('POST /submit', lambda p: client.post('/submit', json=p), requests_per_route),
+            # The dashboard renders the whole store, so a handful of loads is representative
+            ('GET /internal/dashboard', lambda p: client.get('/internal/dashboard'),
+             max(1, min(requests_per_route, 20))),
+        ]
+        for name, call, count in routes:
+            latencies = array('q')
+            errors = 0
+            clock = time.perf_counter_ns
+            start = time.perf_counter()
+            for payload in payloads[:count]:
+                t0 = clock()
+                response = call(payload)
+                latencies.append(clock() - t0)
+                if response.status_code != 200:
+                    errors += 1
+            results.append(summarize(name, size, latencies, time.perf_counter() - start, errors=errors))
+
+    return results
+
+
+def bench_scoring_model(size, seed=42, train_size=5000, batch_size=1000):
+    """Rules vs the learned model: per-call latency, batch throughput and agreement with the rules"""
+    try:
+        from model import MIN_AGREEMENT, ScoringModel
+        train_entries = [{**item, 'analysis': feedback_app.analyze_with_rules(item['feedback'])}
+                         for item in generate_feedback(min(size, train_size), seed + 2)]
+        start = time.perf_counter()
+        model = ScoringModel.train(train_entries)
+    except ImportError:
+        print("⚠️  numpy not installed, skipping model benchmark", file=sys.stderr)
+        return []
+    train_s = time.perf_counter() - start
+    if model.agreement < MIN_AGREEMENT:
+        print(f"⚠️  model reproduces only {model.agreement:.1%} of the rule labels it was trained on",
+              file=sys.stderr)
+
+    results = []
+    clock = time.perf_counter_ns
+    for name, score in [('scoring: rules', lambda text: feedback_app.analyze_with_rules(text)),
+                        ('scoring: model', lambda text: model.analyze([text], feedback_app.get_team_assignment)[0])]:
+        latencies, priorities = array('q'), array('b')
+        start = time.perf_counter()
+        for item in generate_feedback(size, seed):
+            t0 = clock()
+            analysis = score(item['feedback'])
+            latencies.append(clock() - t0)
+            priorities.append(analysis['priority'])
+        wall_s = time.perf_counter() - start
+        agree = sum(priority == feedback_app.analyze_with_rules(item['feedback'])['priority']
+                    for priority, item in zip(priorities, generate_feedback(size, seed)))
+        extra = {'priority_agreement': round(agree / size, 4)} if size else {}
+        if name == 'scoring: model':
+            extra.update(train_s=round(train_s, 3), training_agreement=round(model.agreement, 4))
+        results.append(summarize(name, size, latencies, wall_s, **extra))
+
+    # Batched inference: latency is reported per text so it compares directly with the above
+    latencies = array('q')
+    batch = []
+    start = time.perf_counter()
+    for item in generate_feedback(size, seed):
+        batch.append(item['feedback'])
+        if len(batch) == batch_size:
+            t0 = clock()
+            model.analyze(batch, feedback_app.get_team_assignment)
+            latencies.extend([(clock() - t0) // len(batch)] * len(batch))
+            batch = []
+    if batch:
+        t0 = clock()
+        model.analyze(batch, feedback_app.get_team_assignment)
+        latencies.extend([(clock() - t0) // len(batch)] * len(batch))
+    results.append(summarize(f'scoring: model batch {batch_size}', size, latencies,
+                             time.perf_counter() - start))
+    return results
+
+
+STARTUP_SCRIPT = """
+import sys, time
+t0 = time.perf_counter_ns()
+import app
+t1 = time.perf_counter_ns()
+app.create_app(sys.argv[1])
+t2 = time.perf_counter_ns()
+print(t1 - t0, t2 - t1)
+"""
+
+
+def bench_startup(runs=5):
+    """Cold-start cost in fresh interpreters: importing app, then building it with create_app"""
+    import_ns, create_ns, process_ns = array('q'), array('q'), array('q')
+    here = Path(__file__).resolve().parent
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(runs):
+            t0 = time.perf_counter_ns()
+            output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, str(Path(tmp) / f'store{i}.json')],
+                                    cwd=here, capture_output=True, text=True, check=True).stdout
+            process_ns.append(time.perf_counter_ns() - t0)
+            imported, created = output.split()
+            import_ns.append(int(imported))
+            create_ns.append(int(created))
+    wall = time.perf_counter() - start
+    return [summarize('startup: import app', runs, import_ns, wall),
+            summarize('startup: create_app', runs, create_ns, wall),
+            summarize('startup: process', runs, process_ns, wall)]
+
+
+def compare(current, baseline, out=sys.stderr):
+    """Print mean-latency change per benchmark relative to a previous JSON report"""
+    previous = {(r['name'], r['size']): r for r in baseline.get('results', [])}
+    print(f"{'benchmark':<28}{'size':>10}{'before us':>12}{'after us':>12}{'change':>10}", file=out)
+    for result in current['results']:
+        before = previous.get((result['name'], result['size']))
+        if not before or not before['mean_us']:
+            continue
+        change = (result['mean_us'] - before['mean_us']) / before['mean_us'] * 100
+        print(f"{result['name']:<28}{result['size']:>10}{before['mean_us']:>12.2f}"
+              f"{result['mean_us']:>12.2f}{change:>+9.1f}%", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the feedback prioritizer")
+    parser.add_argument('--sizes', default='1000,10000',
+                        help="Comma-separated dataset sizes (e.g. 1000,100000,10000000)")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per route for load tests")
+    parser.add_argument('--e2e-max-size', type=int, default=50000,
+                        help="Largest store used by the HTTP load tests (larger sizes are capped)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-micro', action='store_true', help="Skip function micro-benchmarks")
+    parser.add_argument('--skip-e2e', action='store_true', help="Skip HTTP load tests")
+    parser.add_argument('--skip-model', action='store_true', help="Skip the rules vs learned model comparison")
+    parser.add_argument('--startup-runs', type=int, default=5, help="Fresh interpreters for startup timing (0 skips)")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--compare', help="Previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    report = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'e2e_max_size': args.e2e_max_size,
+        },
+        'results': [],
+    }
+    if args.startup_runs:
+        report['results'].extend(bench_startup(args.startup_runs))
+    e2e_sizes_done = set()
+    for size in sizes:
+        if not args.skip_micro:
+            report['results'].append(bench_analyze_feedback(size, args.seed))
+            report['results'].append(bench_team_assignment(size, args.seed))
+        if not args.skip_model:
+            report['results'].extend(bench_scoring_model(size, args.seed))
+        # Every /submit rewrites the whole store and the dashboard renders all of it,
+        # so the HTTP stage runs against a capped store (once per distinct capped size)
+        e2e_size = min(size, args.e2e_max_size)
+        if not args.skip_e2e and e2e_size not in e2e_sizes_done:
+            e2e_sizes_done.add(e2e_size)
+            report['results'].extend(bench_endpoints(e2e_size, args.requests, args.seed))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"✅ Benchmark report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+🔄 Customer Feedback Prioritizer - Change Feed
+Cursor-based incremental sync of new feedback for downstream consumers.
+
+GET /api/changes?after=<seq>&limit=100&wait=25
+    Returns entries with seq > after, oldest first, plus the cursor to use next.
+    With wait > 0 the request long-polls for up to `wait` seconds when nothing is new.
+"""
+
+import os
+import time
+
+from flask import current_app, jsonify, request
+
+CHANGES_MAX_LIMIT = 1000
+CHANGES_MAX_WAIT = float(os.environ.get('CHANGES_MAX_WAIT', '30'))
+CHANGES_POLL_INTERVAL = float(os.environ.get('CHANGES_POLL_INTERVAL', '0.25'))
+
+
+def init_changes(app):
+    """Register the change feed route on `app`"""
+
+    @app.route('/api/changes')
+    def feedback_changes():
+        """New feedback after a sequence cursor, optionally long-polling"""
+        after = request.args.get('after', 0, type=int)
+        limit = max(1, min(request.args.get('limit', 100, type=int), CHANGES_MAX_LIMIT))
+        wait = max(0.0, min(request.args.get('wait', 0, type=float), CHANGES_MAX_WAIT))
+        store = current_app.extensions['feedback_store']
+
+        deadline = time.monotonic() + wait
+        size = store.changes_size()
+        changes = store.changes_after(after, limit)
+        while not changes and time.monotonic() < deadline:
+            time.sleep(CHANGES_POLL_INTERVAL)
+            # Stat the log (works across worker processes) and only re-read when it grew
+            if store.changes_size() != size:
+                size = store.changes_size()
+                changes = store.changes_after(after, limit)
+
+        return jsonify({
+            'changes': changes,
+            'next': changes[-1]['seq'] if changes else after,
+            'more': len(changes) == limit,
+        })
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+📤 Customer Feedback Prioritizer - Streaming Export API
+Row-by-row exports of the feedback store for analytics consumers.
+
+GET /api/export?format=ndjson|csv|parquet
+    &category=bug &theme=Performance &min_priority=6   (filters)
+    &after=<seq>                                        (only entries with a later seq)
+
+Rows are generated lazily from the store file, so memory stays constant however large
+the export is. With `after`, rows come from the store's change log instead, which costs
+O(new entries) per pull rather than a full scan; like /api/changes, those rows are the
+entries as they were submitted. Parquet output needs pyarrow and is written one row group
+at a time. CSV cells that a spreadsheet would run as formulas are prefixed with `'`.
+"""
+
+import csv
+import io
+import json
+
+from flask import Response, current_app, jsonify, request
+
+CSV_COLUMNS = ['seq', 'id', 'timestamp', 'name', 'email', 'category', 'feedback',
+               'urgency', 'impact', 'priority', 'theme', 'confidence', 'assigned_team']
+ANALYSIS_COLUMNS = CSV_COLUMNS[7:]
+BATCH_ROWS = 1000
+PARQUET_ROW_GROUP = 10000
+# Leading characters that make spreadsheet apps treat a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def flatten(entry):
+    """One export row: entry fields with the analysis inlined"""
+    analysis = entry.get('analysis', {})
+    row = {column: entry.get(column) for column in CSV_COLUMNS[:7]}
+    row.update({column: analysis.get(column) for column in ANALYSIS_COLUMNS})
+    return row
+
+
+def export_filter(args):
+    """Build a predicate over stored entries from the export query parameters"""
+    category = args.get('category')
+    theme = args.get('theme')
+    min_priority = args.get('min_priority', type=int)
+
+    def matches(entry):
+        analysis = entry.get('analysis', {})
+        if category and entry.get('category') != category:
+            return False
+        if theme and analysis.get('theme') != theme:
+            return False
+        if min_priority is not None and analysis.get('priority', 0) < min_priority:
+            return False
+        return True
+
+    return matches
+
+
+def iter_rows(store, matches, after=None):
+    """Flattened matching entries; with `after`, only later seqs, read from the change log"""
+    if after is None:
+        entries = store.iter_entries()
+    else:
+        entries = iter_changes(store, after)
+    for entry in entries:
+        if matches(entry):
+            yield flatten(entry)
+
+
+def iter_changes(store, after):
+    """Entries with seq > `after`, in change-log batches of BATCH_ROWS"""
+    while True:
+        changes = store.changes_after(after, BATCH_ROWS)
+        yield from changes
+        if len(changes) < BATCH_ROWS:
+            return
+        after = changes[-1]['seq']
+
+
+def csv_safe(row):
+    """Neutralize text cells that a spreadsheet would evaluate as formulas"""
+    return {column: f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+            for column, value in row.items()}
+
+
+def stream_ndjson(rows):
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(row, ensure_ascii=False))
+        if len(batch) >= BATCH_ROWS:
+            yield '\n'.join(batch) + '\n'
+            batch.clear()
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+
+def stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(csv_safe(row))
+        if i % BATCH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every row group"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_parquet(rows, pa, pq):
+    schema = pa.schema([
+        ('seq', pa.int64()), ('id', pa.string()), ('timestamp', pa.string()), ('name', pa.string()),
+        ('email', pa.string()), ('category', pa.string()), ('feedback', pa.string()), ('urgency', pa.int64()),
+        ('impact', pa.int64()), ('priority', pa.int64()), ('theme', pa.string()),
+        ('confidence', pa.int64()), ('assigned_team', pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def write_group(group):
+        columns = {column: [row[column] for row in group] for column in CSV_COLUMNS}
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+    group = []
+    for row in rows:
+        group.append(row)
+        if len(group) >= PARQUET_ROW_GROUP:
+            write_group(group)
+            group.clear()
+            yield sink.drain()
+    if group:
+        write_group(group)
+    writer.close()
+    yield sink.drain()
+
+
+def init_export(app):
+    """Register the streaming export route on `app`"""
+
+    @app.route('/api/export')
+    def export_feedback():
+        """Stream the feedback store as NDJSON, CSV or Parquet"""
+        export_format = request.args.get('format', 'ndjson')
+        store = current_app.extensions['feedback_store']
+        rows = iter_rows(store, export_filter(request.args), request.args.get('after', type=int))
+
+        if export_format == 'ndjson':
+            return Response(stream_ndjson(rows), mimetype='application/x-ndjson')
+        if export_format == 'csv':
+            return Response(stream_csv(rows), mimetype='text/csv',
+                            headers={'Content-Disposition': 'attachment; filename=feedback.csv'})
+        if export_format == 'parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                return jsonify({'error': 'Parquet export requires pyarrow (pip install pyarrow)'}), 501
+            return Response(stream_parquet(rows, pa, pq), mimetype='application/vnd.apache.parquet',
+                            headers={'Content-Disposition': 'attachment; filename=feedback.parquet'})
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+🧠 Customer Feedback Prioritizer - Learned Scoring Model
+Lightweight CPU-only alternative to the rule engine: hashed bag-of-words features
+feeding linear softmax heads for urgency, impact and theme.
+
+Trained offline from the stored feedback, where human corrections (POST
+/internal/feedback/<seq>/correction) override the stored analysis and count more.
+A model that reproduces fewer than SCORING_MODEL_MIN_AGREEMENT of its own training
+labels is neither saved nor served. Serving scores whole batches with vectorized sparse ops.
+
+Usage:
+    python model.py check --store customer_feedback.json   # can it reproduce the rules?
+    python model.py train --store customer_feedback.json --output scoring_model.npz
+    SCORING_BACKEND=model python app.py
+
+Requires numpy, which is imported on first use only.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import zlib
+from pathlib import Path
+
+N_FEATURES = 1 << 18
+CORRECTION_WEIGHT = 5.0
+MODEL_PATH = os.environ.get('SCORING_MODEL_PATH', 'scoring_model.npz')
+# Models that reproduce fewer of their own training labels than this are never saved or served
+MIN_AGREEMENT = float(os.environ.get('SCORING_MODEL_MIN_AGREEMENT', '0.9'))
+
+logger = logging.getLogger(__name__)
+
+_token_pattern = re.compile(r"[a-z0-9']+")
+
+
+def hashed_features(text, n_features=N_FEATURES):
+    """Sparse L2-normalized unigram + bigram counts as (indices, values) lists"""
+    tokens = _token_pattern.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode()) % n_features
+        counts[index] = counts.get(index, 0) + 1
+    norm = sum(c * c for c in counts.values()) ** 0.5 or 1.0
+    return list(counts), [c / norm for c in counts.values()]
+
+
+def vectorize(texts, n_features=N_FEATURES):
+    """CSR matrix (indptr, indices, data) for a batch of texts"""
+    import numpy as np
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        idx, values = hashed_features(text, n_features)
+        indices.extend(idx)
+        data.extend(values)
+        indptr.append(len(indices))
+    return (np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64),
+            np.asarray(data, dtype=np.float64))
+
+
+def csr_matmul(indptr, indices, data, weights):
+    """X @ W for a CSR X without materializing X"""
+    import numpy as np
+    out = np.zeros((len(indptr) - 1, weights.shape[1]))
+    if len(indices):
+        contributions = data[:, None] * weights[indices]
+        nonempty = np.flatnonzero(np.diff(indptr))
+        out[nonempty] = np.add.reduceat(contributions, indptr[nonempty], axis=0)
+    return out
+
+
+def label_of(entry):
+    """(urgency, impact, theme, weight) training target; human corrections win over the stored analysis"""
+    analysis = dict(entry.get('analysis') or {})
+    correction = entry.get('correction') or {}
+    if 'model_version' in analysis and not correction:
+        # The model's own uncorrected predictions would only teach it its mistakes
+        return None
+    if 'priority' in correction and 'urgency' not in correction and 'impact' not in correction:
+        # A priority-only correction means "this deserves priority p" on both axes
+        correction = {**correction, 'urgency': correction['priority'], 'impact': correction['priority']}
+    analysis.update(correction)
+    if not {'urgency', 'impact', 'theme'} <= analysis.keys():
+        return None
+    return analysis['urgency'], analysis['impact'], analysis['theme'], CORRECTION_WEIGHT if correction else 1.0
+
+
+class ScoringModel:
+    """Softmax heads over hashed features; columns are [*urgency, *impact, *theme logits]
+
+    Urgency and impact are classified over the score values seen in training rather than
+    regressed: the rule scores are discrete keyword outcomes, which a linear regression
+    smears towards the mean.
+
+    Only the rows of features seen in training are kept: `weights[i]` belongs to hashed
+    feature `features[i]`, and any other feature maps to a trailing zero row.
+    """
+
+    def __init__(self, features, weights, bias, urgency_values, impact_values, themes, n_features=N_FEATURES,
+                 version='untrained', agreement=0.0):
+        import numpy as np
+        self.features = np.asarray(features, dtype=np.int64)
+        self.weights = np.vstack([weights, np.zeros((1, weights.shape[1]))])
+        self._rows = {feature: row for row, feature in enumerate(self.features.tolist())}
+        self.bias = bias
+        self.urgency_values = [int(v) for v in urgency_values]
+        self.impact_values = [int(v) for v in impact_values]
+        self.themes = list(themes)
+        self.n_features = n_features
+        self.version = version
+        self.agreement = float(agreement)
+        u, m = len(self.urgency_values), len(self.impact_values)
+        self._heads = ((0, u), (u, u + m), (u + m, u + m + len(self.themes)))
+
+    @classmethod
+    def train(cls, entries, epochs=100, learning_rate=0.5, l2=1e-6, n_features=N_FEATURES):
+        import numpy as np
+        rows = [(entry['feedback'], label) for entry in entries
+                if entry.get('feedback') and (label := label_of(entry)) is not None]
+        if not rows:
+            raise ValueError("No labelled feedback to train on")
+
+        urgency_values = sorted({int(label[0]) for _, label in rows})
+        impact_values = sorted({int(label[1]) for _, label in rows})
+        themes = sorted({label[2] for _, label in rows})
+        n = len(rows)
+        onehot = []
+        for values, position in ((urgency_values, 0), (impact_values, 1), (themes, 2)):
+            index = {value: i for i, value in enumerate(values)}
+            block = np.zeros((n, len(values)))
+            block[np.arange(n), [index[label[position]] for _, label in rows]] = 1.0
+            onehot.append(block)
+        onehot = np.hstack(onehot)
+        k = onehot.shape[1]
+        u, m = len(urgency_values), len(impact_values)
+        heads = ((0, u), (u, u + m), (u + m, k))
+
+        indptr, indices, data = vectorize([text for text, _ in rows], n_features)
+        sample_weight = np.array([label[3] for _, label in rows])
+        sample_weight /= sample_weight.sum()
+
+        # X^T @ R via a one-off sort of the column indices, so each epoch is two reduceats
+        row_of = np.repeat(np.arange(n), np.diff(indptr))
+        order = np.argsort(indices, kind='stable')
+        columns, starts = np.unique(indices[order], return_index=True)
+        sorted_data = data[order][:, None]
+        sorted_rows = row_of[order]
+
+        # Only columns seen in training are ever non-zero, so optimize that slice. AdaGrad
+        # step sizes let rare keywords (one override word in a few hundred texts) converge
+        # as fast as common ones, which plain gradient descent needs thousands of epochs for
+        active = np.zeros((len(columns), k))
+        bias = np.zeros(k)
+        active_sq, bias_sq = np.full_like(active, 1e-8), np.full_like(bias, 1e-8)
+        remap = np.searchsorted(columns, indices)
+        for _ in range(epochs):
+            scores = csr_matmul(indptr, remap, data, active) + bias
+            residual = _softmax_heads(scores, heads) - onehot
+            residual *= sample_weight[:, None]
+
+            gradient = np.add.reduceat(sorted_data * residual[sorted_rows], starts, axis=0) + l2 * active
+            bias_gradient = residual.sum(axis=0)
+            active_sq += gradient * gradient
+            bias_sq += bias_gradient * bias_gradient
+            active -= learning_rate * gradient / np.sqrt(active_sq)
+            bias -= learning_rate * bias_gradient / np.sqrt(bias_sq)
+
+        version = f"{zlib.crc32(active.tobytes() + columns.tobytes()) & 0xffffffff:08x}"
+        model = cls(columns, active, bias, urgency_values, impact_values, themes, n_features, version)
+        model.agreement = model.agreement_with(rows)
+        return model
+
+    def agreement_with(self, rows):
+        """Share of (text, label) rows whose urgency, impact and theme the model reproduces exactly"""
+        if not rows:
+            return 0.0
+        predicted = self.analyze([text for text, _ in rows], lambda priority, theme: None)
+        hits = sum((p['urgency'], p['impact'], p['theme']) == (label[0], label[1], label[2])
+                   for p, (_, label) in zip(predicted, rows))
+        return hits / len(rows)
+
+    def save(self, path, min_agreement=MIN_AGREEMENT):
+        import numpy as np
+        if self.agreement < min_agreement:
+            raise ValueError(f"Model reproduces only {self.agreement:.1%} of its training labels "
+                             f"(minimum {min_agreement:.0%}); not saving it")
+        tmp_path = Path(f"{path}.tmp.npz")
+        np.savez_compressed(tmp_path, features=self.features, weights=self.weights[:-1], bias=self.bias,
+                            urgency_values=np.array(self.urgency_values),
+                            impact_values=np.array(self.impact_values),
+                            themes=np.array(self.themes), n_features=self.n_features,
+                            version=np.array(self.version), agreement=self.agreement)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, min_agreement=MIN_AGREEMENT):
+        import numpy as np
+        with np.load(path, allow_pickle=False) as saved:
+            agreement = float(saved['agreement'])
+            if agreement < min_agreement:
+                raise ValueError(f"{path} reproduces only {agreement:.1%} of its training labels")
+            return cls(saved['features'], saved['weights'], saved['bias'], saved['urgency_values'].tolist(),
+                       saved['impact_values'].tolist(), saved['themes'].tolist(), int(saved['n_features']),
+                       str(saved['version']), agreement)
+
+    def analyze(self, texts, assign_team):
+        """Score a batch of texts into analysis dicts shaped like the rule engine's"""
+        if len(texts) == 1:
+            return [self._analyze_one(texts[0], assign_team)]
+        import numpy as np
+        indptr, indices, data = vectorize(texts, self.n_features)
+        # Map hashed features to weight rows; unseen ones land on the trailing zero row
+        rows = np.searchsorted(self.features, indices)
+        known = rows < len(self.features)
+        known[known] = self.features[rows[known]] == indices[known]
+        rows[~known] = len(self.features)
+        scores = csr_matmul(indptr, rows, data, self.weights) + self.bias
+        (u0, u1), (m0, m1), (t0, t1) = self._heads
+        urgency = scores[:, u0:u1].argmax(axis=1).tolist()
+        impact = scores[:, m0:m1].argmax(axis=1).tolist()
+        probabilities = _softmax_heads(scores[:, t0:t1], ((0, t1 - t0),))
+        best = probabilities.argmax(axis=1)
+        probability = probabilities[np.arange(len(best)), best].tolist()
+        return [self._result(self.urgency_values[u], self.impact_values[m], self.themes[t], p, assign_team)
+                for u, m, t, p in zip(urgency, impact, best.tolist(), probability)]
+
+    def _analyze_one(self, text, assign_team):
+        # Single-text fast path: one gather-and-sum, then plain Python over a single short row
+        indices, values = hashed_features(text, self.n_features)
+        unseen = len(self.features)
+        rows = [self._rows.get(index, unseen) for index in indices]
+        scores = (values @ self.weights[rows] + self.bias).tolist()
+        (u0, u1), (m0, m1), (t0, t1) = self._heads
+        urgency = self.urgency_values[max(range(u1 - u0), key=scores[u0:u1].__getitem__)]
+        impact = self.impact_values[max(range(m1 - m0), key=scores[m0:m1].__getitem__)]
+        logits = scores[t0:t1]
+        best = max(range(len(logits)), key=logits.__getitem__)
+        probability = 1.0 / sum(math.exp(logit - logits[best]) for logit in logits)
+        return self._result(urgency, impact, self.themes[best], probability, assign_team)
+
+    def _result(self, urgency, impact, theme, probability, assign_team):
+        priority = min(10, max(urgency, impact, (urgency + impact) // 2))
+        return {
+            'urgency': urgency,
+            'impact': impact,
+            'priority': priority,
+            'theme': theme,
+            'confidence': min(95, int(probability * 100)),
+            'assigned_team': assign_team(priority, theme),
+            'model_version': self.version,
+        }
+
+
+def _softmax_heads(scores, heads):
+    """Softmax applied separately to each (start, stop) column block of `scores`"""
+    import numpy as np
+    probabilities = np.empty_like(scores)
+    for start, stop in heads:
+        block = np.exp(scores[:, start:stop] - scores[:, start:stop].max(axis=1, keepdims=True))
+        probabilities[:, start:stop] = block / block.sum(axis=1, keepdims=True)
+    return probabilities
+
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def get_scoring_model(path=MODEL_PATH):
+    """Model at `path`, reloaded when the file changes; None if missing, refused or numpy is unavailable"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _load_lock:
+        cached = _loaded.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            model = ScoringModel.load(path)
+        except (ImportError, OSError, ValueError, KeyError) as e:
+            logger.warning(f"Scoring model {path} not loaded, using the rules until it changes: {e}")
+            model = None
+        # Failures are cached too, so a bad file costs one load attempt per change, not per request
+        _loaded[path] = (mtime, model)
+        return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the learned feedback scoring model")
+    sub = parser.add_subparsers(dest='command', required=True)
+    train = sub.add_parser('train', help="Train from stored feedback and corrections")
+    train.add_argument('--output', default=MODEL_PATH)
+    check = sub.add_parser('check', help="Train on the current rules' labels and verify the model reproduces them")
+    for command in (train, check):
+        command.add_argument('--store', default=os.environ.get('FEEDBACK_FILE', 'customer_feedback.json'))
+        command.add_argument('--epochs', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    from storage import FeedbackStore
+    entries = list(FeedbackStore(args.store).iter_entries())
+    if args.command == 'check':
+        from rules import RULES_FILE, compile_rules
+        rules = compile_rules(RULES_FILE.read_bytes())
+        entries = [{'feedback': entry['feedback'], 'analysis': rules.analyze(entry['feedback'].lower())}
+                   for entry in entries if entry.get('feedback')]
+    try:
+        model = ScoringModel.train(entries, epochs=args.epochs)
+        if args.command == 'train':
+            model.save(args.output)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    corrected = sum(1 for entry in entries if entry.get('correction'))
+    report = {'trained_on': len(entries), 'corrections': corrected, 'themes': model.themes,
+              'agreement': round(model.agreement, 4), 'version': model.version}
+    if args.command == 'train':
+        report['output'] = args.output
+    print(json.dumps(report, indent=2))
+    if model.agreement < MIN_AGREEMENT:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+🔬 Customer Feedback Prioritizer - Request Profiling
+Opt-in sampling profiler for the internal routes, safe to leave enabled in production.
+
+Profile a request with `?profile=1` or an `X-Profile-Token` header matching PROFILE_TOKEN.
+Profiles are stored as folded stacks (flamegraph.pl / speedscope compatible) and can be
+fetched from /internal/profiles/<profile_id>.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from flask import g, request, abort, Response
+
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', 'profiles'))
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_MIN_INTERVAL = float(os.environ.get('PROFILE_MIN_INTERVAL', '10'))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.001'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '50'))
+
+_profile_id_pattern = re.compile(r'^[\w.-]+$')
+
+
+class StackSampler:
+    """Samples one thread's call stack on a background thread and counts folded stacks"""
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfileRateLimiter:
+    """Allows at most one profiled request per `min_interval` seconds (per worker process)"""
+
+    def __init__(self, min_interval=PROFILE_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._last = float('-inf')
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last < self.min_interval:
+                return False
+            self._last = now
+            return True
+
+
+def profiling_requested():
+    """True when the current internal-route request asked to be profiled"""
+    if not request.path.startswith('/internal/') or request.path.startswith('/internal/profiles'):
+        return False
+    if request.args.get('profile') == '1':
+        return True
+    return bool(PROFILE_TOKEN) and request.headers.get('X-Profile-Token') == PROFILE_TOKEN
+
+
+def save_profile(sampler, endpoint):
+    """Write folded stacks to PROFILE_DIR and prune old profiles; returns the profile id"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{endpoint or 'request'}.folded"
+    (PROFILE_DIR / profile_id).write_text(sampler.folded())
+
+    profiles = sorted(PROFILE_DIR.glob('*.folded'), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:-PROFILE_KEEP]:
+        old.unlink(missing_ok=True)
+    return profile_id
+
+
+def init_profiling(app):
+    """Register the profiling hooks and the profile download route on `app`"""
+    limiter = ProfileRateLimiter()
+
+    @app.before_request
+    def start_profiling():
+        if not profiling_requested():
+            return
+        if not limiter.acquire():
+            g.profile_skipped = True
+            return
+        g.profiler = StackSampler(threading.get_ident()).start()
+
+    @app.after_request
+    def finish_profiling(response):
+        sampler = g.pop('profiler', None)
+        if sampler is not None:
+            sampler.stop()
+            try:
+                profile_id = save_profile(sampler, request.endpoint)
+                response.headers['X-Profile-Id'] = profile_id
+                response.headers['X-Profile-Duration'] = f"{sampler.duration:.4f}"
+            except OSError as e:
+                app.logger.error(f"Profile save error: {e}")
+        elif g.pop('profile_skipped', False):
+            response.headers['X-Profile-Skipped'] = 'rate-limited'
+        return response
+
+    @app.teardown_request
+    def abandon_profiling(exc):
+        sampler = g.pop('profiler', None)
+        if sampler is not None:
+            sampler.stop()
+
+    @app.route('/internal/profiles/<profile_id>')
+    def download_profile(profile_id):
+        """Folded-stack profile for a previously profiled request"""
+        path = PROFILE_DIR / profile_id
+        if not _profile_id_pattern.match(profile_id) or not path.is_file():
+            abort(404)
+        return Response(path.read_text(), mimetype='text/plain')
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🚦 Customer Feedback Prioritizer - Rate Limiting & Request Coalescing
+In-process token buckets keyed by client, per route, plus coalescing of identical in-flight work.
+
+Limits are per worker process. Configure them with RATE_LIMITS, e.g.
+    RATE_LIMITS="/analyze=60/minute,/submit=10/minute"
+Counters are served from /internal/metrics/rate-limits.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import request, jsonify
+
+DEFAULT_RATE_LIMITS = {'/analyze': '60/minute', '/submit': '10/minute'}
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+MAX_TRACKED_CLIENTS = int(os.environ.get('RATE_LIMIT_MAX_CLIENTS', '10000'))
+TRUST_PROXY = os.environ.get('TRUST_PROXY', '0') == '1'
+
+
+def parse_limit(spec):
+    """'60/minute' -> (capacity, tokens per second)"""
+    count, _, period = spec.partition('/')
+    if period not in PERIODS or not count.strip().isdigit() or int(count) <= 0:
+        raise ValueError(f"Invalid rate limit: {spec!r} (expected e.g. '60/minute')")
+    return int(count), int(count) / PERIODS[period]
+
+
+def parse_limits(text):
+    """'/analyze=60/minute,/submit=10/minute' -> {'/analyze': '60/minute', ...}"""
+    limits = {}
+    for item in text.split(','):
+        if item.strip():
+            route, _, spec = item.partition('=')
+            limits[route.strip()] = spec.strip()
+    return limits
+
+
+class RateLimiter:
+    """Token bucket per client; idle clients are evicted beyond `max_clients`"""
+
+    def __init__(self, capacity, refill_rate, max_clients=MAX_TRACKED_CLIENTS):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_clients = max_clients
+        self.allowed = 0
+        self.rejected = 0
+        self._buckets = OrderedDict()  # client -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def allow(self, client):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(client, None)
+            if bucket is None:
+                bucket = [self.capacity, now]
+            else:
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_rate)
+                bucket[1] = now
+            self._buckets[client] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_after(self):
+        return max(1, round(1 / self.refill_rate))
+
+    def stats(self):
+        with self._lock:
+            return {'allowed': self.allowed, 'rejected': self.rejected, 'tracked_clients': len(self._buckets)}
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Coalescer:
+    """Concurrent calls with the same key share the first caller's computation"""
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+
+def client_key():
+    """Client identity: first X-Forwarded-For hop behind a trusted proxy, else the peer address"""
+    if TRUST_PROXY:
+        forwarded = request.headers.get('X-Forwarded-For', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.remote_addr or 'unknown'
+
+
+def init_rate_limits(app, limits=None):
+    """Attach per-route limiters to `app`; returns the analyze coalescer"""
+    if limits is None:
+        limits = parse_limits(os.environ['RATE_LIMITS']) if 'RATE_LIMITS' in os.environ else DEFAULT_RATE_LIMITS
+    limiters = {route: RateLimiter(*parse_limit(spec)) for route, spec in limits.items()}
+    coalescer = Coalescer()
+    app.extensions['rate_limiters'] = limiters
+    app.extensions['analyze_coalescer'] = coalescer
+
+    @app.before_request
+    def enforce_rate_limit():
+        if request.method == 'OPTIONS':
+            return None
+        limiter = limiters.get(request.path)
+        if limiter is None or limiter.allow(client_key()):
+            return None
+        response = jsonify({'error': 'Too many requests, please slow down'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(limiter.retry_after())
+        return response
+
+    @app.route('/internal/metrics/rate-limits')
+    def rate_limit_metrics():
+        """Allowed/rejected counters per limited route and coalescing stats (this worker only)"""
+        return jsonify({
+            'pid': os.getpid(),
+            'routes': {route: limiter.stats() for route, limiter in limiters.items()},
+            'analyze_coalescing': coalescer.stats(),
+        })
+
+    return coalescer
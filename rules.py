@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+📐 Customer Feedback Prioritizer - Scoring Rules as Data
+Keyword patterns, scores, themes and team routing loaded from scoring_rules.json.
+
+The config is compiled once into ordered pattern tuples and routing lookup tables
+(plain substring scans beat a combined regex for feedback-sized texts). Edits are
+picked up without a restart: the file is re-checked at most every RULES_RELOAD_INTERVAL
+seconds and the new rule set is swapped in atomically, so in-flight requests finish on
+the version they started with. Invalid edits are logged and the previous rules stay live.
+
+Every analysis records the `rules_version` (a hash of the parsed config) it was scored with;
+`python rules.py rescore` re-scores only entries from older versions.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+RULES_FILE = Path(os.environ.get('SCORING_RULES_FILE', Path(__file__).with_name('scoring_rules.json')))
+RULES_RELOAD_INTERVAL = float(os.environ.get('RULES_RELOAD_INTERVAL', '1'))
+
+logger = logging.getLogger(__name__)
+
+
+def _patterns(items):
+    return tuple(dict.fromkeys(str(p).lower() for p in items))
+
+
+def _first_score(text, contexts):
+    for pattern, score in contexts:
+        if pattern in text:
+            return score
+    return None
+
+
+def _contains_any(text, patterns):
+    for pattern in patterns:
+        if pattern in text:
+            return True
+    return False
+
+
+class CompiledRules:
+    """Immutable, ready-to-evaluate form of one scoring config"""
+
+    def __init__(self, config, version):
+        self.version = version
+        defaults = config.get('defaults', {})
+        self.default_urgency = int(defaults.get('urgency', 3))
+        self.default_impact = int(defaults.get('impact', 3))
+        self.default_theme = defaults.get('theme', 'General')
+
+        self.overrides = tuple((o['theme'], _patterns(o['patterns']), int(o['urgency']), int(o['impact']))
+                               for o in config.get('overrides', []))
+        self.urgency = tuple((str(p).lower(), int(s)) for p, s in config.get('urgency', []))
+        self.impact = tuple((str(p).lower(), int(s)) for p, s in config.get('impact', []))
+        self.themes = tuple((t['theme'], _patterns(t['patterns'])) for t in config.get('themes', []))
+
+        confidence = config.get('confidence', {})
+        self.confidence_base = int(confidence.get('base', 60))
+        self.confidence_step = max(1, int(confidence.get('chars_per_point', 10)))
+        self.confidence_max = int(confidence.get('max', 95))
+
+        routing = config.get('routing', {})
+        self.theme_routes = {k.lower(): v for k, v in routing.get('themes', {}).items()}
+        tiers = [(int(t['min_priority']), {k.lower(): v for k, v in t.get('themes', {}).items()}, t['team'])
+                 for t in routing.get('tiers', [])]
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier[0], reverse=True))
+        self.default_team = routing.get('default', 'Product Team')
+
+    def assign_team(self, priority_score, theme):
+        theme_lower = theme.lower()
+        team = self.theme_routes.get(theme_lower)
+        if team is not None:
+            return team
+        for min_priority, themes, tier_team in self.tiers:
+            if priority_score >= min_priority:
+                return themes.get(theme_lower, tier_team)
+        return self.default_team
+
+    def analyze(self, text):
+        """Score lower-cased `text`; same shape as the rest of the app's analyses"""
+        urgency_score, impact_score = self.default_urgency, self.default_impact
+        for theme, patterns, urgency, impact in self.overrides:
+            if _contains_any(text, patterns):
+                urgency_score, impact_score = urgency, impact
+                break
+        else:
+            score = _first_score(text, self.urgency)
+            if score is not None:
+                urgency_score = max(urgency_score, score)
+            score = _first_score(text, self.impact)
+            if score is not None:
+                impact_score = max(impact_score, score)
+            theme = self.default_theme
+            for candidate, patterns in self.themes:
+                if _contains_any(text, patterns):
+                    theme = candidate
+                    break
+
+        priority_score = min(10, max(urgency_score, impact_score, (urgency_score + impact_score) // 2))
+        return {
+            'urgency': urgency_score,
+            'impact': impact_score,
+            'priority': priority_score,
+            'theme': theme,
+            'confidence': min(self.confidence_max, self.confidence_base + len(text) // self.confidence_step),
+            'assigned_team': self.assign_team(priority_score, theme),
+            'rules_version': self.version,
+        }
+
+
+def compile_rules(raw):
+    """Parse and compile config bytes; the version is a hash of the parsed content
+
+    Hashing a canonical form means whitespace, indentation and key-order edits keep the
+    version (and so don't trigger a rescore of the whole store).
+    """
+    config = json.loads(raw)
+    canonical = json.dumps(config, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return CompiledRules(config, hashlib.sha256(canonical.encode()).hexdigest()[:12])
+
+
+class RuleBook:
+    """Holds the live CompiledRules for a config file and hot-reloads it on change"""
+
+    def __init__(self, path=RULES_FILE, reload_interval=RULES_RELOAD_INTERVAL):
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self._rules = None
+        self._mtime = None
+        self._checked = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Live rules; readers never block unless a reload is due"""
+        if time.monotonic() - self._checked >= self.reload_interval:
+            self._maybe_reload()
+        return self._rules
+
+    def _maybe_reload(self):
+        with self._lock:
+            if time.monotonic() - self._checked < self.reload_interval:
+                return
+            self._checked = time.monotonic()
+            try:
+                mtime = self.path.stat().st_mtime_ns
+                if mtime == self._mtime and self._rules is not None:
+                    return
+                rules = compile_rules(self.path.read_bytes())
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if self._rules is None:
+                    raise
+                logger.error(f"Rules reload failed, keeping version {self._rules.version}: {e}")
+                return
+            if self._rules is None or rules.version != self._rules.version:
+                logger.info(f"📐 Scoring rules version {rules.version} loaded from {self.path}")
+            # Single reference swap: requests already holding the old rules keep using them
+            self._rules, self._mtime = rules, mtime
+
+
+def rescore_outdated(store, rules):
+    """Re-analyze entries scored by other rule versions; model-scored and corrected entries are left alone"""
+    rescored = 0
+
+    def mutate(feedback_list):
+        nonlocal rescored
+        for entry in feedback_list:
+            analysis = entry.get('analysis') or {}
+            if 'model_version' in analysis or entry.get('correction'):
+                continue
+            if analysis.get('rules_version') != rules.version:
+                entry['analysis'] = rules.analyze(entry.get('feedback', '').lower())
+                rescored += 1
+
+    store.update(mutate)
+    return rescored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect scoring rules and rescore outdated feedback")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('version', help="Print the version of the current rules file")
+    rescore = sub.add_parser('rescore', help="Re-score entries scored by older rule versions")
+    rescore.add_argument('--store', default=os.environ.get('FEEDBACK_FILE', 'customer_feedback.json'))
+    args = parser.parse_args(argv)
+
+    rules = compile_rules(RULES_FILE.read_bytes())
+    if args.command == 'version':
+        print(rules.version)
+        return
+
+    from storage import FeedbackStore
+    store = FeedbackStore(args.store)
+    store.initialize()
+    count = rescore_outdated(store, rules)
+    print(f"✅ Rescored {count} entries with rules version {rules.version}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+🏭 Customer Feedback Prioritizer - Production Server
+Runs the app under gunicorn with preloaded, multi-process, multi-threaded workers.
+
+Configuration (environment variables):
+    HOST / PORT            bind address (default 0.0.0.0:5001)
+    WEB_CONCURRENCY        worker processes (default 2 x CPUs + 1)
+    WORKER_THREADS         threads per worker (default 4)
+    GRACEFUL_TIMEOUT       seconds to drain in-flight requests on shutdown (default 30)
+    REQUEST_TIMEOUT        seconds before a stuck worker is restarted (default 60)
+"""
+
+import multiprocessing
+import os
+import sys
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+
+def server_options():
+    workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+    return {
+        'bind': f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5001')}",
+        'workers': workers,
+        'worker_class': 'gthread',
+        'threads': int(os.environ.get('WORKER_THREADS', '4')),
+        # Import the app once in the master so every fork starts warm
+        'preload_app': True,
+        # SIGTERM stops accepting connections and lets in-flight submits finish
+        'graceful_timeout': int(os.environ.get('GRACEFUL_TIMEOUT', '30')),
+        'timeout': int(os.environ.get('REQUEST_TIMEOUT', '60')),
+        'keepalive': 5,
+        'accesslog': '-',
+        'errorlog': '-',
+    }
+
+
+def worker_exit(server, worker):
+    server.log.info(f"👋 Worker {worker.pid} drained and exited")
+
+
+if BaseApplication is not None:
+    class FeedbackServer(BaseApplication):
+        """Embedded gunicorn application serving the Flask app"""
+
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+            self.cfg.set('worker_exit', worker_exit)
+
+        def load(self):
+            from app import create_app
+            return create_app()
+
+
+def main():
+    if BaseApplication is None:
+        print("❌ gunicorn is not installed: pip install gunicorn", file=sys.stderr)
+        sys.exit(1)
+
+    options = server_options()
+    print(f"\n🏭 Customer Feedback Prioritizer - {options['workers']} workers x "
+          f"{options['threads']} threads on http://{options['bind']}\n")
+    FeedbackServer(options).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+💾 Customer Feedback Prioritizer - Feedback Storage
+JSON file store that is safe to share between worker processes.
+
+Writers serialize on an advisory file lock and replace the file atomically,
+so readers never see a half-written store and concurrent submits are never lost.
+
+Every entry gets a monotonically increasing `seq`. New entries are also appended to an
+NDJSON change log ordered by seq, which lets consumers read only what changed after a
+cursor (binary search + O(delta) read) instead of re-reading the whole store.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# Read once at import: os.umask can only be queried by setting it, which races with other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class FeedbackStore:
+    """Feedback list persisted as a JSON array at `path`"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self.changes_path = self.path.with_name(self.path.stem + '.changes.ndjson')
+        self._thread_lock = threading.Lock()
+
+    def initialize(self):
+        """Create an empty store if none exists yet, and bring older stores up to date"""
+        with self.locked():
+            if not self.path.exists():
+                self._write([])
+            first = next(self.iter_entries(), None)
+            if first is not None and 'seq' not in first:
+                # One-time migration of stores written before sequence ids existed
+                feedback_list = self.load()
+                for seq, entry in enumerate(feedback_list, 1):
+                    entry['seq'] = seq
+                self._write(feedback_list)
+                self.changes_path.unlink(missing_ok=True)
+            if not self.changes_path.exists():
+                with open(self.changes_path, 'w') as log:
+                    for entry in self.iter_entries():
+                        log.write(json.dumps(entry) + '\n')
+
+    @contextmanager
+    def locked(self):
+        """Exclusive lock across threads and worker processes"""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self):
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return []
+
+    def iter_entries(self, chunk_size=1 << 16):
+        """Yield entries one at a time, reading the file in chunks (constant memory)"""
+        decoder = json.JSONDecoder()
+        try:
+            f = open(self.path)
+        except OSError:
+            return
+        with f:
+            buffer, pos, eof, started = '', 0, False, False
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) and not started:
+                    if buffer[pos] != '[':
+                        return
+                    started, pos = True, pos + 1
+                    continue
+                if pos < len(buffer) and buffer[pos] == ']':
+                    return
+                if pos < len(buffer):
+                    try:
+                        entry, pos = decoder.raw_decode(buffer, pos)
+                        yield entry
+                        continue
+                    except ValueError:
+                        if eof:
+                            return
+                elif eof:
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+
+    def save(self, feedback_list):
+        try:
+            with self.locked():
+                self._write(feedback_list)
+            return True
+        except OSError:
+            return False
+
+    def update(self, mutate):
+        """Apply `mutate` to the full list and write it back, all under the lock"""
+        with self.locked():
+            feedback_list = self.load()
+            mutate(feedback_list)
+            self._write(feedback_list)
+
+    def append(self, entry):
+        """Add one entry with the next sequence id; returns the stored entry, or None on failure"""
+        try:
+            with self.locked():
+                feedback_list = self.load()
+                last_seq = feedback_list[-1].get('seq', len(feedback_list)) if feedback_list else 0
+                seq = max(last_seq, self.last_change_seq()) + 1
+                stored = {'id': str(seq), 'seq': seq, **entry}
+                feedback_list.append(stored)
+                self._write(feedback_list)
+
+                # Entries missing from the log (crash between the two writes) are logged first,
+                # after dropping any unterminated line a killed writer left at its end
+                self._truncate_partial_line()
+                logged = self.last_change_seq()
+                start = len(feedback_list) - 1
+                while start > 0 and feedback_list[start - 1].get('seq', 0) > logged:
+                    start -= 1
+                with open(self.changes_path, 'a') as log:
+                    log.write(''.join(json.dumps(e) + '\n' for e in feedback_list[start:]))
+                    log.flush()
+                    os.fsync(log.fileno())
+            return stored
+        except OSError:
+            return None
+
+    def last_change_seq(self):
+        """Sequence id of the newest complete change log line (0 when empty)"""
+        try:
+            with open(self.changes_path, 'rb') as log:
+                position, tail = log.seek(0, os.SEEK_END), b''
+                while position > 0:
+                    step = min(4096, position)
+                    position -= step
+                    log.seek(position)
+                    tail = log.read(step) + tail
+                    # Bytes after the last newline are a torn write and are ignored
+                    complete = tail[:tail.rfind(b'\n') + 1]
+                    lines = complete.split(b'\n')
+                    # The first piece may be cut off unless the read reached the start of the file
+                    candidates = lines if position == 0 else lines[1:]
+                    for line in reversed(candidates):
+                        seq = self._seq_of(line)
+                        if seq is not None:
+                            return seq
+        except OSError:
+            pass
+        return 0
+
+    def changes_after(self, after, limit=100):
+        """Up to `limit` entries with seq > `after`, oldest first"""
+        try:
+            log = open(self.changes_path, 'rb')
+        except OSError:
+            return []
+        with log:
+            # Binary search for the first line whose seq is greater than `after`
+            low, high = 0, log.seek(0, os.SEEK_END)
+            while low < high:
+                middle = (low + high) // 2
+                self._seek_line(log, middle)
+                line = log.readline()
+                # A torn final line (no newline) counts as the end of the log
+                seq = self._seq_of(line) if line.endswith(b'\n') else None
+                if seq is None or seq > after:
+                    high = middle
+                else:
+                    low = middle + 1
+            self._seek_line(log, low)
+            changes = []
+            for line in log:
+                if len(changes) >= limit or not line.endswith(b'\n'):
+                    break
+                try:
+                    changes.append(json.loads(line))
+                except ValueError:
+                    continue
+            return changes
+
+    def changes_size(self):
+        """Cheap change detection for long-polling: size of the change log in bytes"""
+        try:
+            return self.changes_path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _seq_of(line):
+        """seq of one change log line, or None for blank or corrupt lines"""
+        if not line.strip():
+            return None
+        try:
+            return json.loads(line)['seq']
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _truncate_partial_line(self):
+        """Cut the change log back to its last newline (caller holds the lock)"""
+        try:
+            with open(self.changes_path, 'rb+') as log:
+                end = log.seek(0, os.SEEK_END)
+                position = end
+                while position > 0:
+                    step = min(4096, position)
+                    log.seek(position - step)
+                    newline = log.read(step).rfind(b'\n')
+                    if newline >= 0:
+                        position = position - step + newline + 1
+                        break
+                    position -= step
+                if position != end:
+                    log.truncate(position)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _seek_line(log, offset):
+        """Position `log` at the first line starting at or after `offset`"""
+        log.seek(max(0, offset - 1))
+        if offset > 0:
+            log.readline()
+
+    def _write(self, feedback_list):
+        # mkstemp creates 0600 files; keep the store's existing mode (or the umask default)
+        try:
+            mode = self.path.stat().st_mode & 0o777
+        except OSError:
+            mode = 0o666 & ~_UMASK
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f'.{self.path.name}.')
+        try:
+            os.chmod(tmp_path, mode)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(feedback_list, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+import ratelimit
+from ratelimit import Coalescer, RateLimiter, parse_limit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, 'monotonic', clock)
+    return clock
+
+
+def test_parse_limit():
+    assert parse_limit('60/minute') == (60, 1.0)
+    with pytest.raises(ValueError):
+        parse_limit('60/fortnight')
+
+
+def test_bucket_allows_a_burst_then_rejects(clock):
+    limiter = RateLimiter(3, 1.0)
+    assert [limiter.allow('a') for _ in range(4)] == [True, True, True, False]
+    assert limiter.stats()['allowed'] == 3
+    assert limiter.stats()['rejected'] == 1
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    limiter = RateLimiter(3, 1.0)
+    for _ in range(3):
+        limiter.allow('a')
+    assert not limiter.allow('a')
+
+    clock.now += 1.0
+    assert limiter.allow('a')
+    assert not limiter.allow('a')
+
+    clock.now += 60.0
+    assert [limiter.allow('a') for _ in range(4)] == [True, True, True, False]
+
+
+def test_buckets_are_per_client(clock):
+    limiter = RateLimiter(1, 1.0)
+    assert limiter.allow('a')
+    assert not limiter.allow('a')
+    assert limiter.allow('b')
+
+
+def test_idle_clients_are_evicted_beyond_the_cap(clock):
+    limiter = RateLimiter(1, 1.0, max_clients=2)
+    for client in 'abc':
+        limiter.allow(client)
+    assert limiter.stats()['tracked_clients'] == 2
+    assert limiter.allow('a')  # evicted, so it starts with a full bucket again
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_coalescer_shares_one_result():
+    coalescer, release = Coalescer(), threading.Event()
+    results = []
+
+    def slow():
+        release.wait(5)
+        return {'priority': 7}
+
+    threads = [threading.Thread(target=lambda: results.append(coalescer.run('key', slow))) for _ in range(3)]
+    threads[0].start()
+    _wait_for(lambda: coalescer.stats()['in_flight'] == 1)
+    for thread in threads[1:]:
+        thread.start()
+    _wait_for(lambda: coalescer.stats()['coalesced'] == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{'priority': 7}] * 3
+    assert coalescer.stats() == {'executed': 1, 'coalesced': 2, 'in_flight': 0}
+
+
+def test_coalescer_propagates_the_leaders_error_to_followers():
+    coalescer, release = Coalescer(), threading.Event()
+    errors = []
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError('analysis failed')
+
+    def call():
+        try:
+            coalescer.run('key', failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    _wait_for(lambda: coalescer.stats()['in_flight'] == 1)
+    for thread in threads[1:]:
+        thread.start()
+    _wait_for(lambda: coalescer.stats()['coalesced'] == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3 and all(str(e) == 'analysis failed' for e in errors)
+    # A failed key is not cached: the next call runs again
+    assert coalescer.run('key', lambda: 'ok') == 'ok'
@@ -0,0 +1,107 @@
+import json
+import multiprocessing
+import os
+import stat
+import threading
+
+import pytest
+
+import storage
+from storage import FeedbackStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FeedbackStore(tmp_path / 'feedback.json')
+    store.initialize()
+    return store
+
+
+def logged_seqs(store):
+    return [json.loads(line)['seq'] for line in store.changes_path.read_text().splitlines()]
+
+
+def _append_many(path, threads, per_thread):
+    store = FeedbackStore(path)
+
+    def work():
+        for i in range(per_thread):
+            assert store.append({'feedback': f'{os.getpid()}-{i}'}) is not None
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def test_concurrent_appends_get_unique_gap_free_seqs(store):
+    processes, threads, per_thread = 3, 2, 10
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_append_many, args=(store.path, threads, per_thread))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    total = processes * threads * per_thread
+    seqs = [entry['seq'] for entry in store.iter_entries()]
+    assert seqs == list(range(1, total + 1))
+    assert [entry['id'] for entry in store.iter_entries()] == [str(seq) for seq in seqs]
+    assert logged_seqs(store) == seqs
+
+
+def test_torn_trailing_log_line_is_ignored_and_repaired(store):
+    for i in range(5):
+        store.append({'feedback': f'entry {i}'})
+    with open(store.changes_path, 'a') as log:
+        log.write('{"seq": 6, "feedb')  # a writer killed mid-line
+
+    assert store.last_change_seq() == 5
+    assert [entry['seq'] for entry in store.changes_after(0)] == [1, 2, 3, 4, 5]
+    assert store.changes_after(5) == []
+
+    assert store.append({'feedback': 'after the crash'})['seq'] == 6
+    assert logged_seqs(store) == [1, 2, 3, 4, 5, 6]
+    assert store.changes_after(5)[0]['feedback'] == 'after the crash'
+
+
+def test_corrupt_log_line_is_skipped(store):
+    for i in range(3):
+        store.append({'feedback': f'entry {i}'})
+    with open(store.changes_path, 'a') as log:
+        log.write('not json\n')
+
+    assert store.last_change_seq() == 3
+    assert [entry['seq'] for entry in store.changes_after(0)] == [1, 2, 3]
+
+
+def test_changes_after_boundaries(store):
+    for i in range(10):
+        store.append({'feedback': f'entry {i}'})
+
+    assert [entry['seq'] for entry in store.changes_after(0)] == list(range(1, 11))
+    assert [entry['seq'] for entry in store.changes_after(-5)] == list(range(1, 11))
+    assert [entry['seq'] for entry in store.changes_after(9)] == [10]
+    assert store.changes_after(10) == []
+    assert store.changes_after(100) == []
+    assert [entry['seq'] for entry in store.changes_after(3, limit=2)] == [4, 5]
+
+
+def test_changes_after_on_empty_store(store):
+    assert store.changes_after(0) == []
+    assert store.last_change_seq() == 0
+
+
+def test_rewrites_keep_the_store_file_mode(store):
+    os.chmod(store.path, 0o640)
+    store.append({'feedback': 'hello'})
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o640
+
+
+def test_new_store_uses_the_umask_default(tmp_path):
+    store = FeedbackStore(tmp_path / 'fresh.json')
+    store.initialize()
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o666 & ~storage._UMASK
@@ -0,0 +1,81 @@
+import datetime
+
+import pytest
+
+from storage import FeedbackStore
+from trends import TrendTracker, spike_score
+
+NOW = 1_800_000_000.0
+
+
+def stamp(minutes_ago):
+    return datetime.datetime.fromtimestamp(NOW - minutes_ago * 60).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def submit(store, minutes_ago, theme='General', category='general'):
+    store.append({'timestamp': stamp(minutes_ago), 'category': category, 'analysis': {'theme': theme}})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FeedbackStore(tmp_path / 'feedback.json')
+    store.initialize()
+    return store
+
+
+def warm_up(store, minutes=40):
+    for minutes_ago in range(minutes + 5, 5, -1):
+        submit(store, minutes_ago)
+
+
+def test_spike_score_against_a_flat_baseline():
+    score, recent = spike_score([1] * 55 + [5] * 5, 5)
+    assert recent == 25
+    assert score > 3
+
+
+def test_small_burst_into_a_fresh_store_is_not_a_spike(store):
+    tracker = TrendTracker()
+    for _ in range(3):
+        submit(store, 0, theme='System Failure', category='bug')
+    assert tracker.sync(store, NOW) == []
+    assert not tracker.warmed_up(int(NOW // 60))
+
+
+def test_burst_after_warm_up_is_a_spike_and_reported_once(store):
+    tracker = TrendTracker()
+    warm_up(store)
+    assert tracker.sync(store, NOW) == []
+
+    for _ in range(10):
+        submit(store, 0, theme='Security Critical', category='bug')
+    spikes = tracker.sync(store, NOW)
+    assert {(spike['kind'], spike['name']) for spike in spikes} == {
+        ('theme', 'Security Critical'), ('category', 'bug')}
+
+    submit(store, 0, theme='Security Critical', category='bug')
+    assert tracker.sync(store, NOW) == []
+
+
+def test_junk_categories_cannot_crowd_out_themes(store):
+    tracker = TrendTracker(max_categories=20)
+    warm_up(store)
+    for i in range(50):
+        submit(store, 0, category=f'junk-{i}')
+    for _ in range(10):
+        submit(store, 0, theme='Security Critical', category='bug')
+
+    spikes = tracker.sync(store, NOW)
+    assert ('theme', 'Security Critical') in {(spike['kind'], spike['name']) for spike in spikes}
+    snapshot = tracker.snapshot(now=NOW)
+    assert len(snapshot['series']['category']) == 20
+    assert 'bug' in snapshot['series']['category']
+
+
+def test_first_sync_replays_only_the_window(store):
+    for minutes_ago in (300, 200, 120, 30, 10):
+        submit(store, minutes_ago)
+    tracker = TrendTracker(window_minutes=60)
+    assert tracker._window_start(store, int(NOW // 60)) == 3
+    tracker.sync(store, NOW)
+    assert sum(tracker.snapshot(now=NOW)['series']['theme']['General']) == 2
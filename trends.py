@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+📈 Customer Feedback Prioritizer - Trend & Spike Detection
+Per-theme and per-category counts over a sliding window of minute buckets.
+
+The tracker consumes the store's change feed, so every worker sees submits made by
+any other worker. On first sync it binary-searches the feed for the start of the window
+and replays only from there. Each series is a fixed-size ring buffer. Themes come from
+the scoring rules and are always tracked; categories are client-supplied, so at most
+TREND_MAX_CATEGORIES of them are tracked: a category quiet for a whole window is dropped,
+and at the cap the least recently active one is evicted to make room for a new one. Memory is constant regardless of how much history exists.
+
+Every worker process runs its own tracker, so each one logs a given spike once: with N
+workers a spike produces up to N log warnings. /api/trends is the same from any worker.
+
+A series is flagged as spiking when its count over the last TREND_SPIKE_MINUTES is
+TREND_Z_THRESHOLD standard deviations above what the rest of the window predicts, is at
+least TREND_MIN_COUNT, and the tracker is warmed up: overall feedback arrived in at least
+TREND_MIN_BASELINE_MINUTES of the baseline minutes. Without the warm-up an empty baseline
+would turn any small burst on a quiet deployment into an alert.
+"""
+
+import datetime
+import math
+import os
+import statistics
+import threading
+import time
+
+from flask import current_app, jsonify, request
+
+TREND_WINDOW_MINUTES = int(os.environ.get('TREND_WINDOW_MINUTES', '60'))
+TREND_SPIKE_MINUTES = int(os.environ.get('TREND_SPIKE_MINUTES', '5'))
+TREND_Z_THRESHOLD = float(os.environ.get('TREND_Z_THRESHOLD', '3'))
+TREND_MIN_COUNT = int(os.environ.get('TREND_MIN_COUNT', '8'))
+TREND_MIN_BASELINE_MINUTES = int(os.environ.get('TREND_MIN_BASELINE_MINUTES', '10'))
+TREND_MAX_CATEGORIES = int(os.environ.get('TREND_MAX_CATEGORIES', '200'))
+# On first sync at most this many of the newest entries are replayed, bounding startup cost
+TREND_BACKFILL = int(os.environ.get('TREND_BACKFILL', '100000'))
+
+
+class MinuteRing:
+    """Counts per minute for the last `size` minutes"""
+
+    __slots__ = ('size', 'counts', 'minutes')
+
+    def __init__(self, size):
+        self.size = size
+        self.counts = [0] * size
+        self.minutes = [-1] * size
+
+    def add(self, minute, amount=1):
+        slot = minute % self.size
+        if self.minutes[slot] != minute:
+            self.minutes[slot] = minute
+            self.counts[slot] = 0
+        self.counts[slot] += amount
+
+    def series(self, now_minute):
+        """Oldest-to-newest counts ending at `now_minute`"""
+        result = []
+        for minute in range(now_minute - self.size + 1, now_minute + 1):
+            slot = minute % self.size
+            result.append(self.counts[slot] if self.minutes[slot] == minute else 0)
+        return result
+
+
+def spike_score(series, spike_minutes=TREND_SPIKE_MINUTES):
+    """z-score of the count over the last `spike_minutes` against the preceding baseline"""
+    baseline, recent = series[:-spike_minutes], sum(series[-spike_minutes:])
+    mean = statistics.fmean(baseline) if baseline else 0.0
+    deviation = statistics.pstdev(baseline) if len(baseline) > 1 else 0.0
+    expected = mean * spike_minutes
+    # Poisson floor keeps a quiet baseline from turning every blip into a spike
+    spread = max(deviation * math.sqrt(spike_minutes), math.sqrt(expected), 1.0)
+    return (recent - expected) / spread, recent
+
+
+class TrendTracker:
+    """Sliding-window series keyed by ('theme' | 'category', name)"""
+
+    def __init__(self, window_minutes=TREND_WINDOW_MINUTES, spike_minutes=TREND_SPIKE_MINUTES,
+                 z_threshold=TREND_Z_THRESHOLD, min_count=TREND_MIN_COUNT, max_categories=TREND_MAX_CATEGORIES,
+                 min_baseline_minutes=TREND_MIN_BASELINE_MINUTES):
+        self.window_minutes = max(window_minutes, spike_minutes + 2)
+        self.spike_minutes = spike_minutes
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.max_categories = max_categories
+        self.min_baseline_minutes = min_baseline_minutes
+        self.cursor = None
+        self._overall = MinuteRing(self.window_minutes)
+        self._series = {}
+        self._alerting = set()
+        self._lock = threading.Lock()
+
+    def sync(self, store, now=None):
+        """Fold new change-feed entries into the window; returns newly detected spikes"""
+        with self._lock:
+            now_minute = int((now or time.time()) // 60)
+            if self.cursor is None:
+                self.cursor = self._window_start(store, now_minute)
+            touched = set()
+            while True:
+                changes = store.changes_after(self.cursor, 1000)
+                for entry in changes:
+                    touched.update(self._add(entry, now_minute))
+                if changes:
+                    self.cursor = changes[-1]['seq']
+                if len(changes) < 1000:
+                    break
+
+            # Categories that have been quiet for the whole window are dropped outright
+            for key in [key for key in self._series if key[0] == 'category'
+                        and max(self._series[key].minutes) <= now_minute - self.window_minutes]:
+                del self._series[key]
+                self._alerting.discard(key)
+
+            new_spikes = []
+            for key in touched:
+                spike = self._spike(key, now_minute)
+                if spike and key not in self._alerting:
+                    new_spikes.append(spike)
+                    self._alerting.add(key)
+                elif not spike:
+                    self._alerting.discard(key)
+            return new_spikes
+
+    def _window_start(self, store, now_minute):
+        """Cursor just before the first entry inside the window (entries are appended in time order)"""
+        low, high = max(0, store.last_change_seq() - TREND_BACKFILL), store.last_change_seq()
+        while low < high:
+            middle = (low + high) // 2
+            following = store.changes_after(middle, 1)
+            minute = self._minute_of(following[0]) if following else None
+            if minute is None or minute > now_minute - self.window_minutes:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    @staticmethod
+    def _minute_of(entry):
+        try:
+            stamp = datetime.datetime.strptime(entry['timestamp'], "%Y-%m-%d %H:%M:%S")
+        except (KeyError, ValueError):
+            return None
+        return int(stamp.timestamp() // 60)
+
+    def _add(self, entry, now_minute):
+        minute = self._minute_of(entry)
+        if minute is None or minute <= now_minute - self.window_minutes or minute > now_minute:
+            return []
+
+        self._overall.add(minute)
+        keys = [('theme', entry.get('analysis', {}).get('theme', 'General')),
+                ('category', entry.get('category', 'general'))]
+        for key in keys:
+            ring = self._series.get(key)
+            if ring is None:
+                if key[0] == 'category':
+                    self._make_room_for_category()
+                ring = self._series[key] = MinuteRing(self.window_minutes)
+            ring.add(minute)
+        return keys
+
+    def _make_room_for_category(self):
+        """Evict the least recently active category series while at the category cap"""
+        categories = [key for key in self._series if key[0] == 'category']
+        while categories and len(categories) >= self.max_categories:
+            quietest = min(categories, key=lambda key: max(self._series[key].minutes))
+            categories.remove(quietest)
+            del self._series[quietest]
+            self._alerting.discard(quietest)
+
+    def warmed_up(self, now_minute):
+        """True once overall feedback arrived in enough baseline minutes to trust the z-scores"""
+        baseline = self._overall.series(now_minute)[:-self.spike_minutes]
+        return sum(1 for count in baseline if count) >= self.min_baseline_minutes
+
+    def _spike(self, key, now_minute):
+        ring = self._series.get(key)
+        if ring is None or not self.warmed_up(now_minute):
+            return None
+        series = ring.series(now_minute)
+        score, recent = spike_score(series, self.spike_minutes)
+        if score < self.z_threshold or recent < self.min_count:
+            return None
+        return {'kind': key[0], 'name': key[1], 'z_score': round(score, 2), 'recent_count': recent,
+                'recent_minutes': self.spike_minutes}
+
+    def snapshot(self, kind=None, now=None):
+        """Current series and spikes, optionally limited to one kind"""
+        with self._lock:
+            now_minute = int((now or time.time()) // 60)
+            series, spikes = {}, []
+            for key in sorted(self._series):
+                if kind and key[0] != kind:
+                    continue
+                series.setdefault(key[0], {})[key[1]] = self._series[key].series(now_minute)
+                spike = self._spike(key, now_minute)
+                if spike:
+                    spikes.append(spike)
+            return {
+                'window_minutes': self.window_minutes,
+                'warmed_up': self.warmed_up(now_minute),
+                'window_end': datetime.datetime.fromtimestamp(now_minute * 60).strftime("%Y-%m-%d %H:%M"),
+                'series': series,
+                'anomalies': sorted(spikes, key=lambda s: s['z_score'], reverse=True),
+            }
+
+
+def init_trends(app):
+    """Attach a trend tracker to `app` and register the trends route"""
+    tracker = TrendTracker()
+    app.extensions['trend_tracker'] = tracker
+
+    @app.route('/api/trends')
+    def feedback_trends():
+        """Per-minute series for each theme/category over the window, plus current spikes"""
+        tracker.sync(current_app.extensions['feedback_store'])
+        return jsonify(tracker.snapshot(request.args.get('kind')))
+
+    return tracker